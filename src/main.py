@@ -1,26 +1,39 @@
-from tkinter import Tk, filedialog, messagebox, Menu, Toplevel, Text, Scrollbar, Label
-from tkinter.ttk import Button, Progressbar, Style, Frame
+from tkinter import Tk, filedialog, messagebox, Menu, Toplevel, Text, Scrollbar, Label, BooleanVar
+from tkinter.ttk import Button, Checkbutton, Progressbar, Style, Frame
 from utils import batch_process, find_photo_sets
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 import logging
+import os
 from pathlib import Path
-from PIL import Image, ImageTk
-
-# Set up logging with a file handler
-log_file = Path("batch_tool.log")
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file, mode='w', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+from PIL import Image, ImageTk, features
 
-# Function to display instructions in a new window
-def show_instructions():
-    try:
-        instruction_text = """CETAMURA BATCH INGEST TOOL
+# Logging (file handlers behind a background queue listener) is configured in utils
+
+# Photo sets are independent; PIL and zipfile release the GIL for the heavy work
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# How many newly found photo sets trigger a status update during the folder scan
+SCAN_PROGRESS_INTERVAL = 25
+
+# Parent folder chosen in select_folder
+selected_folder = None
+
+# (folder, photo sets) found by the background scan started in select_folder
+scan_result = None
+
+# Set by the Cancel button; batch_process checks it before each file
+cancel_event = threading.Event()
+
+# Window icon and logo locations
+ICON_PATH = Path("C:/Users/saa24b/Downloads/FSU_Lockup_W_V_solid_rgb.ico")
+LOGO_PATH = Path("C:/Users/saa24b/Downloads/FSU_Lockup_W_V_solid_rgb.png")
+LOGO_SIZE = (400, 100)
+# Pre-resized copy of the logo so later launches skip the resample
+LOGO_CACHE_PATH = LOGO_PATH.with_name(f"{LOGO_PATH.stem}_{LOGO_SIZE[0]}x{LOGO_SIZE[1]}.png")
+
+# Help text shown by show_instructions
+INSTRUCTION_TEXT = """CETAMURA BATCH INGEST TOOL
 ==========================
 
 This tool automates the process for creating ingest files for the Cetamura Digital Collections.
@@ -52,6 +65,27 @@ USAGE INSTRUCTIONS
    - Package the files into a ZIP archive.
 """
 
+# Function to load the logo, reusing the cached resized copy when it is up to date
+def load_logo_image():
+    if not LOGO_PATH.exists():
+        return None
+    if LOGO_CACHE_PATH.exists() and LOGO_CACHE_PATH.stat().st_mtime >= LOGO_PATH.stat().st_mtime:
+        with Image.open(LOGO_CACHE_PATH, formats=["PNG"]) as cached_logo:
+            cached_logo.load()
+        return cached_logo
+
+    # reducing_gap lets Pillow shrink a large source cheaply before the final LANCZOS pass
+    with Image.open(LOGO_PATH, formats=["PNG"]) as source_logo:
+        logo_image = source_logo.resize(LOGO_SIZE, Image.LANCZOS, reducing_gap=3.0)
+    try:
+        logo_image.save(LOGO_CACHE_PATH, "PNG")
+    except OSError as e:
+        logging.debug(f"Could not cache resized logo at {LOGO_CACHE_PATH}: {e}")
+    return logo_image
+
+# Function to display instructions in a new window
+def show_instructions():
+    try:
         # Create a new top-level window
         instructions_window = Toplevel(root_window)
         instructions_window.title("Instructions")
@@ -64,7 +98,7 @@ USAGE INSTRUCTIONS
         # Create a Text widget
         text_area = Text(instructions_window, wrap='word', yscrollcommand=scrollbar.set)
         text_area.pack(expand=True, fill='both')
-        text_area.insert('1.0', instruction_text)
+        text_area.insert('1.0', INSTRUCTION_TEXT)
         text_area.config(state='disabled')  # Make the text read-only
 
         # Configure scrollbar
@@ -75,61 +109,154 @@ USAGE INSTRUCTIONS
 
 # Function to select Root Folder
 def select_folder():
+    global selected_folder, scan_result
     folder_selected = filedialog.askdirectory()
+    scan_result = None
     if folder_selected:
-        if not Path(folder_selected).exists():
+        folder_path = Path(folder_selected)
+        if not folder_path.exists():
             messagebox.showerror("Error", "Selected folder does not exist.")
             return
+        selected_folder = folder_path
         label.config(text=f"Selected parent folder: {folder_selected}")
-        btn_process.config(state="normal")
+        status_label.config(text="Scanning for photo sets...")
+        btn_process.config(state="disabled")
+
+        def report_progress(count):
+            if count % SCAN_PROGRESS_INTERVAL == 0:
+                root_window.after(0, apply_scan_progress, folder_path, count)
+
+        # Scan in the background so the window stays responsive on large trees
+        def run_scan():
+            try:
+                photo_sets = find_photo_sets(folder_path, report_progress)
+            except Exception as e:
+                logging.error(f"Error scanning {folder_path}: {e}")
+                photo_sets = None
+            root_window.after(0, apply_scan_result, folder_path, photo_sets)
+
+        threading.Thread(target=run_scan, daemon=True).start()
     else:
+        selected_folder = None
         label.config(text="No folder selected!")
         btn_process.config(state="disabled")
 
+# Function to report how many photo sets the running scan has found so far
+def apply_scan_progress(folder, count):
+    if folder == selected_folder and scan_result is None:
+        status_label.config(text=f"Scanning for photo sets... {count} found so far")
+
+# Function to keep the scan from select_folder for start_batch_process to reuse
+def apply_scan_result(folder, photo_sets):
+    global scan_result
+    if folder != selected_folder:
+        return  # A different folder was selected while this scan was running
+    if photo_sets is None:
+        status_label.config(text="Scan failed. The folder will be rescanned when processing starts.")
+    else:
+        scan_result = (folder, photo_sets)
+        status_label.config(text=f"Found {len(photo_sets)} photo sets. Ready to process.")
+    btn_process.config(state="normal")
+
+# Function to apply widget updates posted from the processing thread
+def apply_ui_state(state):
+    if "progress" in state:
+        done, total = state["progress"]
+        progress["maximum"] = total
+        progress["value"] = done
+        progress_label.config(text=f"{int(done / total * 100)}%")
+    if "status" in state:
+        status_label.config(text=state["status"])
+    if "buttons" in state:
+        btn_select.config(state=state["buttons"])
+        btn_process.config(state=state["buttons"])
+    if "cancel" in state:
+        btn_cancel.config(state=state["cancel"])
+    if "message" in state:
+        show_message, title, text = state["message"]
+        show_message(title, text)
+
 # Function to start batch processing
 def start_batch_process():
-    folder = label.cget("text").replace("Selected parent folder: ", "")
-    if not Path(folder).is_dir():
+    global scan_result
+    folder = selected_folder
+    if folder is None or not folder.is_dir():
         messagebox.showerror("Error", "Please select a valid parent folder.")
         return
 
+    # Reuse the scan from select_folder once; processing renames files, so a later run rescans
+    cached_photo_sets = scan_result[1] if scan_result and scan_result[0] == folder else None
+    scan_result = None
+
+    force = force_var.get()  # read on the Tk thread; the worker only sees the plain bool
+    cancel_event.clear()
     status_label.config(text="Processing...")
     btn_select.config(state="disabled")
     btn_process.config(state="disabled")
+    btn_cancel.config(state="normal")
     logging.info(f"Batch processing started for folder: {folder}")
 
     def run_process():
+        # Widget changes are collected here and applied in one Tk callback when the run ends
+        ui_state = {"buttons": "normal", "cancel": "disabled"}
         try:
-            photo_sets = find_photo_sets(folder)
+            photo_sets = cached_photo_sets if cached_photo_sets is not None else find_photo_sets(folder)
             total_sets = len(photo_sets)
             if (total_sets == 0):
-                root_window.after(0, lambda: messagebox.showinfo("Info", "No photo sets found in the selected folder."))
-                status_label.config(text="No photo sets found.")
+                ui_state["status"] = "No photo sets found."
+                ui_state["message"] = (messagebox.showinfo, "Info", "No photo sets found in the selected folder.")
                 logging.info("No photo sets found in the folder.")
                 return
 
-            progress["maximum"] = total_sets
-            progress["value"] = 0
-
-            for index, (root, jpg_files, xml_files, ini_files) in enumerate(photo_sets):
-                logging.info(f"Processing set {index + 1}/{total_sets}: {root}")
-                batch_process(root, jpg_files, xml_files, ini_files)
-                progress["value"] = index + 1
-                root_window.after(0, lambda val=index+1: progress_label.config(text=f"{int((val) / total_sets * 100)}%"))
+            root_window.after(0, apply_ui_state, {"progress": (0, total_sets)})
+
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                futures = {
+                    executor.submit(batch_process, root, jpg_files, xml_files, ini_files, cancel_event, force): root
+                    for root, jpg_files, xml_files, ini_files in photo_sets
+                }
+                try:
+                    for index, future in enumerate(as_completed(futures)):
+                        future.result()
+                        logging.info(f"Finished set {index + 1}/{total_sets}: {futures[future]}")
+                        root_window.after(0, apply_ui_state, {"progress": (index + 1, total_sets)})
+                        if cancel_event.is_set():
+                            break
+                finally:
+                    # Stop queued sets from starting once one has failed or the run was cancelled
+                    for pending in futures:
+                        pending.cancel()
+
+            if cancel_event.is_set():
+                ui_state["status"] = "Batch processing cancelled."
+                ui_state["message"] = (messagebox.showinfo, "Cancelled", "Batch processing was cancelled. Files packaged so far are kept.")
+                logging.info("Batch processing cancelled by user.")
+                return
 
-            root_window.after(0, lambda: status_label.config(text="Batch processing completed successfully!"))
+            ui_state["status"] = "Batch processing completed successfully!"
+            ui_state["message"] = (messagebox.showinfo, "Success", f"Batch processing completed successfully! Processed files saved in:\n{folder}")
             logging.info("Batch processing completed successfully!")
-            root_window.after(0, lambda: messagebox.showinfo("Success", f"Batch processing completed successfully! Processed files saved in:\n{folder}"))
         except Exception as e:
-            root_window.after(0, lambda: messagebox.showerror("Error", f"An error occurred during processing:\n{e}"))
-            root_window.after(0, lambda: status_label.config(text="Batch processing failed."))
+            ui_state["status"] = "Batch processing failed."
+            ui_state["message"] = (messagebox.showerror, "Error", f"An error occurred during processing:\n{e}")
             logging.error(f"Error during batch processing: {e}")
         finally:
-            root_window.after(0, lambda: btn_select.config(state="normal"))
-            root_window.after(0, lambda: btn_process.config(state="normal"))
+            root_window.after(0, apply_ui_state, ui_state)
 
     threading.Thread(target=run_process).start()
 
+# Function to stop a running batch once the files currently being converted are finished
+def cancel_batch_process():
+    cancel_event.set()
+    btn_cancel.config(state="disabled")
+    status_label.config(text="Cancelling...")
+
+# JPEG decoding dominates conversion time; Pillow wheels built on libjpeg-turbo decode several times faster
+logging.info(
+    "Pillow JPEG library: %s (libjpeg-turbo: %s)",
+    features.version("jpg"), features.check_feature("libjpeg_turbo")
+)
+
 # Initialize the main Tkinter window
 root_window = Tk()
 root_window.title("Cetamura Batch Ingest Tool")
@@ -137,9 +264,9 @@ root_window.geometry("600x500")
 
 # Set the window icon (favicon)
 try:
-    icon_path = Path("C:/Users/saa24b/Downloads/FSU_Lockup_W_V_solid_rgb.ico")
-    if icon_path.exists():
-        icon_image = Image.open(icon_path).resize((32, 32), Image.LANCZOS)
+    if ICON_PATH.exists():
+        with Image.open(ICON_PATH, formats=["ICO"]) as source_icon:
+            icon_image = source_icon.resize((32, 32), Image.LANCZOS, reducing_gap=3.0)
         root_window.iconphoto(False, ImageTk.PhotoImage(icon_image))
     else:
         logging.warning("Icon file not found. Using default window icon.")
@@ -147,9 +274,8 @@ except Exception as e:
     logging.error(f"Error loading window icon: {e}")
 
 try:
-    logo_path = Path("C:/Users/saa24b/Downloads/FSU_Lockup_W_V_solid_rgb.png")
-    if logo_path.exists():
-        logo_image = Image.open(logo_path).resize((400, 100), Image.LANCZOS)
+    logo_image = load_logo_image()
+    if logo_image is not None:
         logo_photo = ImageTk.PhotoImage(logo_image)
     else:
         logging.warning("Logo file not found. Skipping logo display.")
@@ -196,6 +322,14 @@ btn_select.grid(row=0, column=0, padx=10)
 btn_process = Button(button_frame, text="Start Batch Process", command=start_batch_process, state="disabled", style='TButton')
 btn_process.grid(row=0, column=1, padx=10)
 
+btn_cancel = Button(button_frame, text="Cancel", command=cancel_batch_process, state="disabled", style='TButton')
+btn_cancel.grid(row=0, column=2, padx=10)
+
+# Photos packaged by an earlier run are skipped unless this is ticked
+force_var = BooleanVar(value=False)
+chk_force = Checkbutton(main_frame, text="Reprocess photos that already have a ZIP package", variable=force_var)
+chk_force.pack()
+
 # Progress bar and status indicators
 progress = Progressbar(main_frame, orient="horizontal", mode="determinate", style='red.Horizontal.TProgressbar')
 progress.pack(pady=20, fill='x', padx=40, expand=True)
@@ -1,15 +1,48 @@
 from pathlib import Path
+import os
 import logging
+import logging.handlers
+import queue
+import threading
+import atexit
+import functools
+import io
+import mmap
+import traceback
 from PIL import Image,UnidentifiedImageError
 import xml.etree.ElementTree as ET
 import zipfile
-import re
-from typing import Optional
+import shutil
+from typing import Callable, Optional
 
 NAMESPACES = {
     'mods': 'http://www.loc.gov/mods/v3'
 }
 
+# Element tags extract_iid_from_xml looks for, as reported by ElementTree
+IID_TAG_MODS = f"{{{NAMESPACES['mods']}}}identifier"
+IID_TAG = "identifier"
+
+# Translation table for sanitize_name: spaces become underscores, characters that are not
+# allowed in file names are dropped
+NAME_TRANSLATION_TABLE = str.maketrans({' ': '_', **dict.fromkeys('<>:"/\\|?*\'')})
+
+# Threads listing directories for find_photo_sets; directory listing is I/O-bound
+SCAN_WORKERS = 4
+
+# Converted pairs waiting to be zipped; bounds how far conversion runs ahead of packaging
+PACKAGE_QUEUE_SIZE = 8
+# Threads zipping converted pairs per photo set, so one slow archive write doesn't stall the queue
+PACKAGE_WORKERS = 2
+
+# Buffer sizes for packaging: zipfile.write() copies in 8 KB chunks, which is slow for large TIFFs
+ZIP_COPY_BUFFER_SIZE = 128 * 1024
+ZIP_OUTPUT_BUFFER_SIZE = 1024 * 1024
+# Files at least this large are memory-mapped and handed to the archive as zero-copy views of
+# this size
+ZIP_MMAP_THRESHOLD = 8 * 1024 * 1024
+ZIP_MMAP_SLICE_SIZE = 1024 * 1024
+
 # Set up logging
 debug_handler = logging.FileHandler("batch_tool_debug.log", mode="w", encoding="utf-8")
 debug_handler.setLevel(logging.DEBUG)
@@ -17,17 +50,32 @@ debug_handler.setLevel(logging.DEBUG)
 info_handler = logging.FileHandler("batch_tool.log", mode="w", encoding="utf-8")
 info_handler.setLevel(logging.INFO)
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[info_handler, debug_handler, logging.StreamHandler()]
+log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+console_handler = logging.StreamHandler()
+
+info_handler.setFormatter(log_formatter)
+debug_handler.setFormatter(log_formatter)
+console_handler.setFormatter(log_formatter)
+
+# File and console writes happen on a background listener thread; the processing loop only enqueues records
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(
+    log_queue, info_handler, debug_handler, console_handler, respect_handler_level=True
 )
+log_listener.start()
+atexit.register(log_listener.stop)
+
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))  # final formatting is done by the listener's handlers
+
+logging.basicConfig(level=logging.DEBUG, handlers=[queue_handler])
 
+@functools.lru_cache(maxsize=8192)
 def sanitize_name(name: str) -> str:
     """
     Removes or replaces invalid characters and normalizes whitespace.
     """
-    sanitized = re.sub(r'[<>:"/\\|?*\']', '', name.strip().replace(' ', '_'))
+    sanitized = name.strip().translate(NAME_TRANSLATION_TABLE)
     return sanitized
 
 
@@ -41,48 +89,171 @@ def validate_directory_structure(path: Path) -> None:
         raise ValueError(f"Invalid directory structure: {path}. Expected at least 4 levels of directories.")
 
 
-def find_photo_sets(parent_folder: str) -> list:
+def _iter_dir(directory: str):
     """
-    Finds valid photo sets (JPG/JPEG, XML, and manifest.ini) in a directory structure.
+    Yields the os.DirEntry objects of a directory, closing the scandir handle as soon as
+    the listing is consumed.
+    """
+    with os.scandir(directory) as entries:
+        yield from entries
+
+
+def _list_dir(directory: str) -> tuple:
+    """
+    Lists one directory in a single os.scandir pass.
+
+    Returns:
+        tuple: (JPG/JPEG paths, XML paths, manifest.ini path or None, subdirectory paths,
+               symlinked subdirectory paths), with paths kept as plain strings.
+    """
+    jpg_files = []
+    xml_files = []
+    ini_file = None
+    subdirs = []
+    linked_dirs = []
+    buckets = {'.jpg': jpg_files, '.jpeg': jpg_files, '.xml': xml_files}
+    for entry in _iter_dir(directory):
+        if entry.is_dir():
+            if entry.is_symlink():
+                linked_dirs.append(entry.path)
+            else:
+                subdirs.append(entry.path)
+            continue
+        name = entry.name.lower()
+        bucket = buckets.get(os.path.splitext(name)[1])
+        if bucket is not None:
+            bucket.append(entry.path)
+        elif ini_file is None and name == 'manifest.ini':
+            ini_file = entry.path
+    return jpg_files, xml_files, ini_file, subdirs, linked_dirs
+
+
+def _scan_worker(pending: queue.SimpleQueue, results: queue.SimpleQueue) -> None:
+    """
+    Directory-listing stage of _scan_tree: lists (directory, descend) items from pending until
+    it receives None, echoing the descend flag back with each listing.
+    """
+    while True:
+        item = pending.get()
+        if item is None:
+            return
+        directory, descend = item
+        try:
+            results.put((directory, descend, _list_dir(directory)))
+        except PermissionError as e:
+            logging.warning("Skipping unreadable directory %s: %s", directory, e)
+            results.put((directory, descend, None))
+        except Exception as e:
+            results.put((directory, descend, e))
+
+
+def _scan_tree(directory: str):
+    """
+    Walks a directory tree with SCAN_WORKERS threads sharing one queue of directories, so a
+    large subtree is split across all workers instead of being walked by one. Only this
+    generator counts outstanding directories, so the workers need no locking. Like
+    Path.rglob, symlinked directories are listed but not descended into.
+
+    Yields:
+        tuple: (directory, JPG/JPEG paths, XML paths, manifest.ini path or None) for every
+               directory below the given one, in the order the listings complete.
+    """
+    pending = queue.SimpleQueue()
+    results = queue.SimpleQueue()
+    workers = [
+        threading.Thread(target=_scan_worker, args=(pending, results), daemon=True)
+        for _ in range(SCAN_WORKERS)
+    ]
+    for worker in workers:
+        worker.start()
+
+    try:
+        pending.put((directory, True))
+        outstanding = 1
+        while outstanding:
+            current, descend, listing = results.get()
+            outstanding -= 1
+            if isinstance(listing, Exception):
+                raise listing
+            if listing is None:
+                continue  # unreadable, already logged
+
+            jpg_files, xml_files, ini_file, subdirs, linked_dirs = listing
+            if descend:
+                for subdir in subdirs:
+                    pending.put((subdir, True))
+                for linked_dir in linked_dirs:
+                    pending.put((linked_dir, False))
+                outstanding += len(subdirs) + len(linked_dirs)
+            # The top directory itself can't be a photo set
+            if current != directory:
+                yield current, jpg_files, xml_files, ini_file
+    finally:
+        for worker in workers:
+            pending.put(None)
+
+
+def iter_photo_sets(parent_folder: str):
+    """
+    Finds valid photo sets (JPG/JPEG, XML, and manifest.ini) in a directory structure,
+    yielding each one as soon as it is found so callers can report progress during a scan.
 
     Args:
         parent_folder (str): Path to the parent folder to search.
 
-    Returns:
-        list: A list of tuples containing valid photo sets. Each tuple contains:
-              (directory, list of JPG/JPEG files, list of XML files, list of manifest files)
+    Yields:
+        tuple: (directory, list of JPG/JPEG files, list of XML files, list of manifest files)
     """
-    photo_sets = []
     parent_path = Path(parent_folder).resolve()
+    if not parent_path.is_dir():
+        logging.warning("Parent folder %s does not exist or is not a directory", parent_path)
+        return
     logging.info(f"Searching for photo sets in: {parent_path}")
-
-    for candidate_dir in parent_path.rglob('*'):
-        if candidate_dir.is_dir():
-            logging.debug(f"Inspecting directory: {candidate_dir}")
-
-            jpg_files = [
-                f for f in candidate_dir.glob('*')
-                if f.suffix.lower() in ['.jpg', '.jpeg']
-            ]
-            xml_files = [f for f in candidate_dir.glob('*') if f.suffix.lower() == '.xml']
-            ini_file = next(
-                (f for f in candidate_dir.glob('*') if f.name.lower() == 'manifest.ini'),
-                None
+    debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+    for candidate_dir, jpg_files, xml_files, ini_file in _scan_tree(str(parent_path)):
+        if debug_enabled:
+            logging.debug("Inspecting directory: %s", candidate_dir)
+
+        if jpg_files and xml_files and ini_file:
+            logging.info("Valid photo set found in %s", candidate_dir)
+            yield (
+                Path(candidate_dir),
+                [Path(f) for f in jpg_files],
+                [Path(f) for f in xml_files],
+                [Path(ini_file)],
             )
+        else:
+            missing = []
+            if not jpg_files:
+                missing.append("JPG/JPEG files")
+            if not xml_files:
+                missing.append("XML files")
+            if not ini_file:
+                missing.append("manifest.ini")
+            logging.warning("Directory %s missing: %s", candidate_dir, ', '.join(missing))
+
+
+def find_photo_sets(parent_folder: str, on_found: Optional[Callable[[int], None]] = None) -> list:
+    """
+    Finds valid photo sets (JPG/JPEG, XML, and manifest.ini) in a directory structure.
 
-            if jpg_files and xml_files and ini_file:
-                photo_sets.append((candidate_dir, jpg_files, xml_files, [ini_file]))
-                logging.info(f"Valid photo set found in {candidate_dir}")
-            else:
-                missing = []
-                if not jpg_files:
-                    missing.append("JPG/JPEG files")
-                if not xml_files:
-                    missing.append("XML files")
-                if not ini_file:
-                    missing.append("manifest.ini")
-                logging.warning(f"Directory {candidate_dir} missing: {', '.join(missing)}")
+    Args:
+        parent_folder (str): Path to the parent folder to search.
+        on_found (callable, optional): Called with the number of sets found so far each time
+            another set is found, so callers can report progress during a scan.
 
+    Returns:
+        list: A list of tuples containing valid photo sets, sorted by directory. Each tuple contains:
+              (directory, list of JPG/JPEG files, list of XML files, list of manifest files)
+    """
+    photo_sets = []
+    for photo_set in iter_photo_sets(parent_folder):
+        photo_sets.append(photo_set)
+        if on_found is not None:
+            on_found(len(photo_sets))
+    # The parallel walk finds sets in completion order; sort so results are stable between runs
+    photo_sets.sort(key=lambda photo_set: photo_set[0])
     logging.info(f"Total photo sets found: {len(photo_sets)} in {parent_folder}")
     return photo_sets
 
@@ -93,12 +264,13 @@ def fix_corrupted_jpg(jpg_path: Path) -> Optional[Path]:
     try:
         fixed_path = jpg_path.with_name(f"{jpg_path.stem}_fixed{jpg_path.suffix}")
         with Image.open(jpg_path) as img:
-            img = img.convert("RGB")  # Ensure standard RGB encoding
+            if img.mode != "RGB":
+                img = img.convert("RGB")  # Ensure standard RGB encoding
             img.save(fixed_path, "JPEG")
-        logging.info(f"Fixed corrupted image: {jpg_path} -> {fixed_path}")
+        logging.info("Fixed corrupted image: %s -> %s", jpg_path, fixed_path)
         return fixed_path
     except Exception as e:
-        logging.error(f"Failed to fix corrupted image {jpg_path}: {e}")
+        logging.error("Failed to fix corrupted image %s: %s", jpg_path, e)
         return None
 
 
@@ -108,50 +280,80 @@ def convert_jpg_to_tiff(jpg_path: Path) -> Optional[Path]:
     """
     try:
         tiff_path = jpg_path.with_suffix('.tiff')
+        # Unreadable files raise UnidentifiedImageError on open and decode errors surface in
+        # save(), so a separate verify() pass (which forces a second open) is not needed
         with Image.open(jpg_path) as img:
-            img.verify()  # Verify if the image is corrupted
-            img = Image.open(jpg_path)  # Re-open the image to save as TIFF
             img.save(tiff_path, "TIFF")
-        logging.info(f"Converted {jpg_path} to {tiff_path}")
+        logging.info("Converted %s to %s", jpg_path, tiff_path)
         return tiff_path
     except UnidentifiedImageError as e:
-        logging.warning(f"Corrupted file detected: {jpg_path}. Attempting to fix...")
+        logging.warning("Corrupted file detected: %s. Attempting to fix...", jpg_path)
         fixed_path = fix_corrupted_jpg(jpg_path)
         if fixed_path:
             return convert_jpg_to_tiff(fixed_path)  # Retry with the fixed file
-        logging.error(f"Unable to process {jpg_path}: {e}")
+        logging.error("Unable to process %s: %s", jpg_path, e)
         return None
     except Exception as e:
-        logging.error(f"Error converting {jpg_path} to TIFF: {e}")
+        logging.error("Error converting %s to TIFF: %s", jpg_path, e)
         return None
 
+def _may_contain_iid(data: bytes) -> bool:
+    """
+    Cheap byte-level check run before parsing: an <identifier type="IID"> element cannot
+    exist unless the literal IID token does. UTF-16 documents can't be checked this way
+    and always pass.
+    """
+    if data.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return True
+    return b'IID' in data
+
+
 def extract_iid_from_xml(xml_file: Path) -> str:
     """
     Extracts the content of the <identifier type="IID"> tag from an XML file.
     Handles both namespaced and non-namespaced XML files.
     """
     try:
-        tree = ET.parse(xml_file)
-        root = tree.getroot()
-
-        identifier = root.find(".//mods:identifier[@type='IID']", NAMESPACES)
-        if identifier is not None and identifier.text:
-            iid = identifier.text.strip()
-            logging.info(f"Extracted IID '{iid}' from {xml_file}")
-            return iid
-
-        identifier = root.find(".//identifier[@type='IID']")
-        if identifier is not None and identifier.text:
-            iid = identifier.text.strip()
-            logging.info(f"Extracted IID '{iid}' from {xml_file}")
-            return iid
+        data = xml_file.read_bytes()
+        if not _may_contain_iid(data):
+            raise ValueError(f"Missing or invalid <identifier type='IID'> in {xml_file}")
+
+        # Stream the document and stop at the first namespaced IID instead of building the
+        # whole tree. A non-namespaced IID is only used when no namespaced one exists.
+        fallback_iid = None
+        for _, elem in ET.iterparse(io.BytesIO(data), events=('end',)):
+            if elem.text and elem.get('type') == 'IID':
+                if elem.tag == IID_TAG_MODS:
+                    iid = elem.text.strip()
+                    logging.info("Extracted IID '%s' from %s", iid, xml_file)
+                    return iid
+                if elem.tag == IID_TAG and fallback_iid is None:
+                    fallback_iid = elem.text.strip()
+            elem.clear()
+
+        if fallback_iid is not None:
+            logging.info("Extracted IID '%s' from %s", fallback_iid, xml_file)
+            return fallback_iid
 
         raise ValueError(f"Missing or invalid <identifier type='IID'> in {xml_file}")
     except Exception as e:
-        logging.error(f"Error parsing XML file {xml_file}: {e}")
+        logging.error("Error parsing XML file %s: %s", xml_file, e)
         raise e
 
 
+def _suffix_letters(index: int) -> str:
+    """
+    Returns the name suffix for the given conflict attempt: a..z, then aa, ab, ... so
+    more than 26 duplicates still get distinct names.
+    """
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(97 + remainder) + letters
+    return letters
+
+
 def rename_files(path: Path, tiff_file: Path, xml_file: Path, iid: str) -> tuple:
     """
     Renames TIFF and XML files based on the extracted IID, ensuring no unnecessary suffixes are added.
@@ -167,85 +369,203 @@ def rename_files(path: Path, tiff_file: Path, xml_file: Path, iid: str) -> tuple
         conflict = True
 
     if conflict:
+        # List the directory once and probe suffixes in memory rather than stat-ing two
+        # candidates per attempt. Names are compared casefolded on every platform, since
+        # Windows and macOS volumes are usually case-insensitive.
+        existing = {name.casefold() for name in os.listdir(path)}
         suffix = 0
         while True:
-            suffix_letter = chr(97 + suffix)
-            new_tiff_candidate = path / f"{base_name}_{suffix_letter}.tiff"
-            new_xml_candidate = path / f"{base_name}_{suffix_letter}.xml"
-            if not new_tiff_candidate.exists() and not new_xml_candidate.exists():
-                new_tiff_path = new_tiff_candidate
-                new_xml_path = new_xml_candidate
+            suffix_letters = _suffix_letters(suffix)
+            new_tiff_name = f"{base_name}_{suffix_letters}.tiff"
+            new_xml_name = f"{base_name}_{suffix_letters}.xml"
+            if new_tiff_name.casefold() not in existing and new_xml_name.casefold() not in existing:
+                new_tiff_path = path / new_tiff_name
+                new_xml_path = path / new_xml_name
                 break
             suffix += 1
 
     tiff_file.rename(new_tiff_path)
     xml_file.rename(new_xml_path)
-    logging.info(f"Renamed files to {new_tiff_path} and {new_xml_path}")
+    logging.info("Renamed files to %s and %s", new_tiff_path, new_xml_path)
     return new_tiff_path, new_xml_path
 
 
+def _write_to_zip(zipf: zipfile.ZipFile, file_path: Path, arcname: str) -> None:
+    """
+    Streams a file into an open archive. Large files (the TIFFs) are memory-mapped and
+    written as memoryview slices, so their bytes are never copied into Python objects;
+    smaller ones are copied through a large buffer.
+    zipfile's write() takes its own view of each slice. If a write fails, the traceback keeps
+    that view alive and closing the mapping would raise BufferError over the real error, so
+    the traceback's frames are cleared before the views are released.
+    """
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    zinfo.compress_type = zipf.compression
+    with open(file_path, 'rb') as src, zipf.open(zinfo, 'w') as dest:
+        if zinfo.file_size >= ZIP_MMAP_THRESHOLD:
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view:
+                for offset in range(0, len(view), ZIP_MMAP_SLICE_SIZE):
+                    with view[offset:offset + ZIP_MMAP_SLICE_SIZE] as chunk:
+                        try:
+                            dest.write(chunk)
+                        except Exception as e:
+                            traceback.clear_frames(e.__traceback__)
+                            raise
+        else:
+            shutil.copyfileobj(src, dest, ZIP_COPY_BUFFER_SIZE)
+
+
 def package_to_zip(tiff_path: Path, xml_path: Path, manifest_path: Path, output_folder: Path) -> Path:
     """
     Creates a zip file containing .tiff, .xml, and a properly formatted manifest.ini.
+    If writing fails, the partial archive is removed so a later run doesn't mistake it for a
+    finished package.
     """
+    created_path = None
     try:
-        output_folder.mkdir(parents=True, exist_ok=True)
-        base_name = tiff_path.stem
-        zip_path = output_folder / f"{sanitize_name(base_name)}.zip"
-
-        if zip_path.exists():
-            suffix = 0
-            while True:
-                suffix_letter = chr(97 + suffix)
-                zip_candidate = output_folder / f"{sanitize_name(base_name)}_{suffix_letter}.zip"
-                if not zip_candidate.exists():
-                    zip_path = zip_candidate
-                    break
-                suffix += 1
+        base_name = sanitize_name(tiff_path.stem)
+        zip_path = output_folder / f"{base_name}.zip"
 
-        with zipfile.ZipFile(zip_path, 'w') as zipf:
-            zipf.write(tiff_path, arcname=tiff_path.name)
-            zipf.write(xml_path, arcname=xml_path.name)
-            zipf.write(manifest_path, arcname=manifest_path.name)
-        logging.info(f"Created zip archive: {zip_path}")
+        # Mode 'x' claims the archive name atomically, so photo sets processed
+        # concurrently into the same output folder never overwrite each other
+        suffix = 0
+        while True:
+            try:
+                zip_file = open(zip_path, 'xb', buffering=ZIP_OUTPUT_BUFFER_SIZE)
+                created_path = zip_path
+                break
+            except FileExistsError:
+                zip_path = output_folder / f"{base_name}_{_suffix_letters(suffix)}.zip"
+                suffix += 1
+            except FileNotFoundError:
+                # Only the first archive of a batch gets here; later ones skip the mkdir syscalls
+                output_folder.mkdir(parents=True, exist_ok=True)
+
+        # TIFFs dominate the archive and barely deflate, so members are stored uncompressed
+        with zip_file, zipfile.ZipFile(zip_file, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as zipf:
+            _write_to_zip(zipf, tiff_path, tiff_path.name)
+            _write_to_zip(zipf, xml_path, xml_path.name)
+            _write_to_zip(zipf, manifest_path, manifest_path.name)
+        logging.info("Created zip archive: %s", zip_path)
         return zip_path
     except Exception as e:
-        logging.error(f"Error creating zip archive: {e}")
+        logging.error("Error creating zip archive: %s", e)
+        if created_path is not None:
+            # Mode 'x' means this call created the file, so it is ours to remove
+            try:
+                created_path.unlink(missing_ok=True)
+            except OSError as cleanup_error:
+                logging.warning("Could not remove partial archive %s: %s", created_path, cleanup_error)
         raise e
 
 
-def batch_process(root: str, jpg_files: list, xml_files: list, ini_files: list) -> None:
+def _package_worker(package_queue: queue.Queue, manifest_path: Path, output_folder: Path,
+                    packaged: list, error_details: list) -> None:
+    """
+    Packaging stage of batch_process: zips converted files from the queue until it receives None.
+    Several workers may share one queue; each consumes exactly one None.
+    """
+    while True:
+        item = package_queue.get()
+        if item is None:
+            return
+        jpg_file, tiff_path, xml_path = item
+        try:
+            packaged.append(package_to_zip(tiff_path, xml_path, manifest_path, output_folder))
+        except Exception as e:
+            error_details.append(f"File: {jpg_file.name} - Error: {e}")
+
+
+def _is_already_packaged(path: Path, jpg_file: Path, xml_file: Path, iid: str,
+                         manifest_path: Path, output_folder: Path) -> bool:
+    """
+    Checks whether a previous run already converted, renamed, and zipped this pair: the XML
+    carries its IID name, the TIFF exists beside it, and the output folder holds a readable
+    archive, newer than the JPG, with the TIFF (at its full size), the XML, and the manifest.
+    """
+    base_name = sanitize_name(iid)
+    tiff_path = path / f"{base_name}.tiff"
+    if xml_file.name != f"{base_name}.xml":
+        return False
+    zip_path = output_folder / f"{base_name}.zip"
+    try:
+        if zip_path.stat().st_mtime < jpg_file.stat().st_mtime:
+            return False
+        with zipfile.ZipFile(zip_path) as zipf:
+            names = set(zipf.namelist())
+            if not {tiff_path.name, xml_file.name, manifest_path.name} <= names:
+                return False
+            return zipf.getinfo(tiff_path.name).file_size == tiff_path.stat().st_size
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+def batch_process(root: str, jpg_files: list, xml_files: list, ini_files: list,
+                  cancel_event: Optional[threading.Event] = None, force: bool = False) -> None:
     """
     Processes photo sets by converting, renaming, and packaging them into ZIP archives.
+    Conversion runs on the calling thread while packaging threads zip the finished pairs.
+    Pairs packaged by an earlier run are left alone unless force is True.
+    If cancel_event is set, no further pairs are started; pairs already converted are still packaged.
     Logs a summary at the end instead of detailed per-file logs.
     """
     try:
         path = Path(root)
         manifest_path = ini_files[0]
+        output_folder = path.parents[2] / f"CetamuraUploadBatch_{path.parts[-3]}"
 
         # Initialize counters and error tracking
-        processed = 0
         skipped = 0
+        up_to_date = 0
         error_details = []
-
-        for jpg_file, xml_file in zip(jpg_files, xml_files):
-            try:
-                # Process files
-                iid = extract_iid_from_xml(xml_file)
-                tiff_path = convert_jpg_to_tiff(jpg_file)
-                if tiff_path is None:
+        packaged = []
+        package_errors = []
+
+        package_queue = queue.Queue(maxsize=PACKAGE_QUEUE_SIZE)
+        packagers = [
+            threading.Thread(
+                target=_package_worker,
+                args=(package_queue, manifest_path, output_folder, packaged, package_errors),
+                daemon=True,
+            )
+            for _ in range(PACKAGE_WORKERS)
+        ]
+        for packager in packagers:
+            packager.start()
+
+        try:
+            for jpg_file, xml_file in zip(jpg_files, xml_files):
+                if cancel_event is not None and cancel_event.is_set():
+                    logging.info("Processing of %s cancelled", root)
+                    break
+                try:
+                    # Process files
+                    iid = extract_iid_from_xml(xml_file)
+                    if not force and _is_already_packaged(path, jpg_file, xml_file, iid, manifest_path, output_folder):
+                        up_to_date += 1
+                        continue
+
+                    tiff_path = convert_jpg_to_tiff(jpg_file)
+                    if tiff_path is None:
+                        skipped += 1
+                        continue
+
+                    new_tiff, new_xml = rename_files(path, tiff_path, xml_file, iid)
+                    package_queue.put((jpg_file, new_tiff, new_xml))
+
+                except Exception as e:
+                    error_details.append(f"File: {jpg_file.name} - Error: {e}")
                     skipped += 1
-                    continue
-
-                new_tiff, new_xml = rename_files(path, tiff_path, xml_file, iid)
-                output_folder = path.parents[2] / f"CetamuraUploadBatch_{path.parts[-3]}"
-                package_to_zip(new_tiff, new_xml, manifest_path, output_folder)
-
-                processed += 1
+        finally:
+            for packager in packagers:
+                package_queue.put(None)
+            for packager in packagers:
+                packager.join()
 
-            except Exception as e:
-                error_details.append(f"File: {jpg_file.name} - Error: {e}")
-                skipped += 1
+        processed = len(packaged)
+        skipped += len(package_errors)
+        error_details.extend(package_errors)
 
         # Generate summary after processing
         logging.info(f"Batch processing completed for {root}.")
@@ -253,6 +573,7 @@ def batch_process(root: str, jpg_files: list, xml_files: list, ini_files: list)
         Summary for {root}:
         -------------------
         Files Processed: {processed}
+        Files Already Packaged: {up_to_date}
         Files Skipped: {skipped}
         Errors: {len(error_details)}
         """
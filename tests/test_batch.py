@@ -0,0 +1,246 @@
+import errno
+import io
+import pytest
+from PIL import Image
+import zipfile
+import src.utils
+from src.utils import (
+    batch_process,
+    find_photo_sets,
+    rename_files,
+    package_to_zip,
+    extract_iid_from_xml,
+)
+
+
+def test_find_photo_sets_nested(tmp_path):
+    """Test that photo sets are found at any depth and extensions match case-insensitively."""
+    nested_dir = tmp_path / "2006" / "46N-3W" / "001"
+    nested_dir.mkdir(parents=True)
+    (nested_dir / "photo.JPG").touch()
+    (nested_dir / "metadata.XML").touch()
+    (nested_dir / "MANIFEST.ini").touch()
+
+    photo_sets = find_photo_sets(tmp_path)
+    assert len(photo_sets) == 1, "Expected 1 valid photo set"
+    directory, jpg_files, xml_files, ini_files = photo_sets[0]
+    assert directory == nested_dir.resolve()
+    assert [f.name for f in jpg_files] == ["photo.JPG"]
+    assert [f.name for f in xml_files] == ["metadata.XML"]
+    assert [f.name for f in ini_files] == ["MANIFEST.ini"]
+
+
+def test_find_photo_sets_sorted_with_progress(tmp_path):
+    """Test that sets come back sorted by directory and each one is reported as it is found."""
+    set_dirs = [tmp_path / "2006" / "46N-3W" / name for name in ("003", "001", "002")]
+    for set_dir in set_dirs:
+        set_dir.mkdir(parents=True)
+        (set_dir / "photo.jpg").touch()
+        (set_dir / "metadata.xml").touch()
+        (set_dir / "manifest.ini").touch()
+
+    counts = []
+    photo_sets = find_photo_sets(tmp_path, counts.append)
+    assert [photo_set[0] for photo_set in photo_sets] == sorted(d.resolve() for d in set_dirs)
+    assert counts == [1, 2, 3]
+
+
+def test_find_photo_sets_symlinked_set(tmp_path):
+    """Test that a symlinked photo-set directory is found but not descended into."""
+    real_dir = tmp_path / "real" / "001"
+    (real_dir / "deeper").mkdir(parents=True)
+    for target in (real_dir, real_dir / "deeper"):
+        (target / "photo.jpg").touch()
+        (target / "metadata.xml").touch()
+        (target / "manifest.ini").touch()
+
+    upload_dir = tmp_path / "upload" / "2006" / "46N-3W"
+    upload_dir.mkdir(parents=True)
+    try:
+        (upload_dir / "001").symlink_to(real_dir, target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks are not supported here")
+
+    photo_sets = find_photo_sets(tmp_path / "upload")
+    assert [photo_set[0] for photo_set in photo_sets] == [upload_dir.resolve() / "001"]
+
+
+def test_find_photo_sets_missing_folder(tmp_path):
+    """Test that a folder that does not exist yields no photo sets."""
+    assert find_photo_sets(tmp_path / "missing") == []
+
+
+def test_extract_iid_from_xml_missing_iid(tmp_path):
+    """Test that an XML file without an IID identifier raises ValueError."""
+    xml_file = tmp_path / "metadata.xml"
+    xml_file.write_text(
+        """<root>
+           <identifier type="local">not-an-iid</identifier>
+        </root>"""
+    )
+    with pytest.raises(ValueError):
+        extract_iid_from_xml(xml_file)
+
+
+def test_extract_iid_from_xml_prefers_namespaced(tmp_path):
+    """Test that a namespaced IID wins over a non-namespaced one that appears earlier."""
+    xml_file = tmp_path / "metadata.xml"
+    xml_file.write_text(
+        """<root xmlns:mods="http://www.loc.gov/mods/v3">
+           <identifier type="IID">plain-id</identifier>
+           <mods:identifier type="IID">mods-id</mods:identifier>
+        </root>"""
+    )
+    assert extract_iid_from_xml(xml_file) == "mods-id"
+
+
+def test_extract_iid_from_xml_rewritten_file(tmp_path):
+    """Test that an XML file rewritten between calls yields its new IID."""
+    xml_file = tmp_path / "metadata.xml"
+    xml_file.write_text('<root><identifier type="IID">first-id</identifier></root>')
+    assert extract_iid_from_xml(xml_file) == "first-id"
+
+    xml_file.write_text('<root><identifier type="IID">second-longer-id</identifier></root>')
+    assert extract_iid_from_xml(xml_file) == "second-longer-id"
+
+
+def test_package_to_zip_memory_mapped(tmp_path, monkeypatch):
+    """Test that files above the mmap threshold are archived byte-for-byte."""
+    monkeypatch.setattr("src.utils.ZIP_MMAP_THRESHOLD", 1)
+    monkeypatch.setattr("src.utils.ZIP_MMAP_SLICE_SIZE", 1000)
+    tiff_path = tmp_path / "photo.tiff"
+    xml_path = tmp_path / "metadata.xml"
+    manifest_path = tmp_path / "manifest.ini"
+
+    tiff_path.write_bytes(bytes(range(256)) * 64)
+    xml_path.write_text("<root/>")
+    manifest_path.touch()  # empty files cannot be mapped and must still be archived
+
+    zip_path = package_to_zip(tiff_path, xml_path, manifest_path, tmp_path / "output")
+
+    with zipfile.ZipFile(zip_path, 'r') as zipf:
+        assert zipf.read(tiff_path.name) == tiff_path.read_bytes()
+        assert zipf.read(manifest_path.name) == b""
+
+
+class FullDisk(io.BytesIO):
+    """In-memory archive target whose first write past 1 KiB fails like a full disk."""
+
+    failed = False
+
+    def write(self, data):
+        if not self.failed and self.tell() + len(data) > 1024:
+            self.failed = True
+            raise OSError(errno.ENOSPC, "No space left on device")
+        return super().write(data)
+
+
+def test_write_to_zip_memory_mapped_write_error(tmp_path, monkeypatch):
+    """Test that a failed write of a memory-mapped file surfaces the original OSError."""
+    monkeypatch.setattr("src.utils.ZIP_MMAP_THRESHOLD", 1)
+    tiff_path = tmp_path / "photo.tiff"
+    tiff_path.write_bytes(bytes(range(256)) * 64)
+
+    with zipfile.ZipFile(FullDisk(), 'w') as zipf:
+        with pytest.raises(OSError) as exc_info:
+            src.utils._write_to_zip(zipf, tiff_path, tiff_path.name)
+    assert exc_info.value.errno == errno.ENOSPC
+
+
+def test_rename_files_suffix_beyond_z(tmp_path):
+    """Test that conflict suffixes continue with 'aa' once 'a' through 'z' are taken."""
+    base_name = "FSU_Cetamura_photos_20060523_46N3W_001"
+    (tmp_path / f"{base_name}.tiff").touch()
+    for letter in "abcdefghijklmnopqrstuvwxyz":
+        (tmp_path / f"{base_name}_{letter}.tiff").touch()
+
+    tiff_file = tmp_path / "photo.tiff"
+    xml_file = tmp_path / "metadata.xml"
+    tiff_file.touch()
+    xml_file.touch()
+
+    new_tiff_path, new_xml_path = rename_files(tmp_path, tiff_file, xml_file, base_name)
+
+    assert new_tiff_path.name == f"{base_name}_aa.tiff"
+    assert new_xml_path.name == f"{base_name}_aa.xml"
+
+
+def test_rename_files_suffix_conflict_differs_in_case(tmp_path):
+    """Test that an existing name differing only in case counts as a conflict."""
+    base_name = "FSU_Cetamura_photos_20060523_46N3W_001"
+    (tmp_path / f"{base_name}.tiff").touch()
+    (tmp_path / f"{base_name}_A.TIFF").touch()
+
+    tiff_file = tmp_path / "photo.tiff"
+    xml_file = tmp_path / "metadata.xml"
+    tiff_file.touch()
+    xml_file.touch()
+
+    new_tiff_path, new_xml_path = rename_files(tmp_path, tiff_file, xml_file, base_name)
+
+    assert new_tiff_path.name == f"{base_name}_b.tiff"
+    assert new_xml_path.name == f"{base_name}_b.xml"
+
+
+def make_photo_set(tmp_path):
+    """Create one year/trench/photo-number set with a single JPG/XML pair and return the upload folder."""
+    set_dir = tmp_path / "2006" / "46N-3W" / "001"
+    set_dir.mkdir(parents=True)
+    Image.new("RGB", (10, 10)).save(set_dir / "photo.jpg", "JPEG")
+    (set_dir / "metadata.xml").write_text(
+        """<mods:root xmlns:mods="http://www.loc.gov/mods/v3">
+               <mods:identifier type="IID">unique-id-123</mods:identifier>
+           </mods:root>"""
+    )
+    (set_dir / "manifest.ini").touch()
+    return tmp_path / "CetamuraUploadBatch_2006"
+
+
+def test_batch_process_skips_already_packaged(tmp_path):
+    """Test that a second run leaves pairs packaged by the first run alone unless forced."""
+    output_folder = make_photo_set(tmp_path)
+
+    batch_process(*find_photo_sets(tmp_path)[0])
+    assert [p.name for p in output_folder.iterdir()] == ["unique-id-123.zip"]
+
+    batch_process(*find_photo_sets(tmp_path)[0])
+    assert [p.name for p in output_folder.iterdir()] == ["unique-id-123.zip"]
+
+    batch_process(*find_photo_sets(tmp_path)[0], force=True)
+    assert len(list(output_folder.iterdir())) == 2
+
+
+def test_batch_process_reruns_after_packaging_failure(tmp_path, monkeypatch):
+    """Test that a failed packaging leaves no archive behind and the next run packages the pair."""
+    output_folder = make_photo_set(tmp_path)
+    write_to_zip = src.utils._write_to_zip
+
+    def fail_on_manifest(zipf, file_path, arcname):
+        if arcname == "manifest.ini":
+            raise OSError("No space left on device")
+        write_to_zip(zipf, file_path, arcname)
+
+    monkeypatch.setattr("src.utils._write_to_zip", fail_on_manifest)
+    batch_process(*find_photo_sets(tmp_path)[0])
+    assert list(output_folder.iterdir()) == []
+
+    monkeypatch.undo()
+    batch_process(*find_photo_sets(tmp_path)[0])
+    zip_paths = list(output_folder.iterdir())
+    assert len(zip_paths) == 1
+    with zipfile.ZipFile(zip_paths[0]) as zipf:
+        assert "manifest.ini" in zipf.namelist()
+
+
+def test_batch_process_redoes_incomplete_archive(tmp_path):
+    """Test that an archive missing the manifest is not treated as already packaged."""
+    output_folder = make_photo_set(tmp_path)
+    batch_process(*find_photo_sets(tmp_path)[0])
+
+    zip_path = output_folder / "unique-id-123.zip"
+    with zipfile.ZipFile(zip_path, 'w') as zipf:
+        zipf.writestr("unique-id-123.tiff", b"")
+        zipf.writestr("unique-id-123.xml", b"")
+
+    batch_process(*find_photo_sets(tmp_path)[0])
+    assert len(list(output_folder.iterdir())) == 2